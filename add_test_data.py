@@ -4,13 +4,17 @@
 """
 import asyncio
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorClient
-from app.models.lovebug_data import LovebugReport, SeverityLevel, Platform, Location
-import random
+from pymongo import WriteConcern
+from app.models.lovebug_data import SeverityLevel, Platform, SEVERITY_SCORES
+
+# 생성할 테스트 데이터 개수
+NUM_REPORTS = 50
 
 # 서울 지역 좌표
-SEOUL_LOCATIONS = [
+SEOUL_LOCATIONS = (
     {"name": "강남구", "lat": 37.5172, "lng": 127.0473, "district": "강남구"},
     {"name": "서초구", "lat": 37.4837, "lng": 127.0324, "district": "서초구"},
     {"name": "송파구", "lat": 37.5145, "lng": 127.1065, "district": "송파구"},
@@ -21,10 +25,10 @@ SEOUL_LOCATIONS = [
     {"name": "성동구", "lat": 37.5636, "lng": 127.0366, "district": "성동구"},
     {"name": "광진구", "lat": 37.5384, "lng": 127.0822, "district": "광진구"},
     {"name": "동대문구", "lat": 37.5744, "lng": 127.0396, "district": "동대문구"},
-]
+)
 
 # 테스트 메시지 템플릿
-TEST_MESSAGES = [
+TEST_MESSAGES = (
     "러브버그가 너무 많아요 😱 공원에서 산책하기 힘들어요",
     "오늘 아침에 러브버그 떼를 만났어요. 정말 깜짝 놀랐네요!",
     "러브버그 때문에 창문을 열 수가 없어요 ㅠㅠ",
@@ -35,7 +39,14 @@ TEST_MESSAGES = [
     "오늘 러브버그 상황이 심각해요. 마스크 착용 필수!",
     "러브버그가 차에 달라붙어서 운전이 힘들어요",
     "공원에서 러브버그 떼를 피해 다니고 있어요",
-]
+)
+
+# 보고서별로 2개씩 섞어 넣는 추가 키워드
+EXTRA_KEYWORDS = ("공원", "산책", "외출", "주의", "많음")
+
+# 열거형 멤버 튜플 (루프/호출마다 list(Enum)을 다시 만들지 않도록 한 번만 구성)
+SEVERITIES = tuple(SeverityLevel)
+PLATFORMS = tuple(Platform)
 
 async def add_test_data():
     """테스트 데이터 추가"""
@@ -51,47 +62,65 @@ async def add_test_data():
     await collection.delete_many({})
     print("기존 데이터 삭제 완료")
     
-    # 테스트 데이터 생성
+    # 테스트 데이터 생성: 난수를 numpy로 한 번에 벡터 생성하고
+    # 문서는 dict로 직접 구성 (행마다 random.* 호출 + Pydantic 검증 생략)
+    n = NUM_REPORTS
+    rng = np.random.default_rng()
+
+    base_lats = np.array([loc["lat"] for loc in SEOUL_LOCATIONS])
+    base_lngs = np.array([loc["lng"] for loc in SEOUL_LOCATIONS])
+
+    loc_idx = rng.integers(0, len(SEOUL_LOCATIONS), n)
+    lats = base_lats[loc_idx] + rng.uniform(-0.01, 0.01, n)  # 좌표에 약간의 랜덤성 추가
+    lngs = base_lngs[loc_idx] + rng.uniform(-0.01, 0.01, n)
+    hours_ago = rng.integers(1, 73, n)  # 최근 72시간 내
+    msg_idx = rng.integers(0, len(TEST_MESSAGES), n)
+    sev_idx = rng.integers(0, len(SEVERITIES), n)
+    plat_idx = rng.integers(0, len(PLATFORMS), n)
+    sentiments = rng.uniform(-1.0, 1.0, n)
+
+    # 행마다 EXTRA_KEYWORDS 중 2개 비복원 추출 (random.sample의 벡터판)
+    extra_idx = rng.permuted(
+        np.tile(np.arange(len(EXTRA_KEYWORDS)), (n, 1)), axis=1
+    )[:, :2]
+
+    # 조회 경로가 UTC 기준으로 필터링하므로 시드 데이터도 UTC로 생성
+    now = datetime.now(timezone.utc)
     test_reports = []
+
+    for i in range(n):
+        location_data = SEOUL_LOCATIONS[loc_idx[i]]
+        severity = SEVERITIES[sev_idx[i]]
+        lat = float(lats[i])
+        lng = float(lngs[i])
+        created_at = now - timedelta(hours=int(hours_ago[i]))
+
+        test_reports.append({
+            "tweet_id": f"tweet_{i+1}",
+            "platform": PLATFORMS[plat_idx[i]].value,
+            "content": TEST_MESSAGES[msg_idx[i]],
+            "author": f"테스트사용자{i+1}",
+            "created_at": created_at,
+            "updated_at": created_at,
+            "location": {
+                "latitude": lat,
+                "longitude": lng,
+                "address": f"{location_data['name']} 일대",
+                "district": location_data["district"],
+                "city": None,
+            },
+            "geo": {"type": "Point", "coordinates": [lng, lat]},
+            "severity": severity.value,
+            "severity_score": SEVERITY_SCORES[severity],
+            "confidence": 0.0,
+            "sentiment": float(sentiments[i]),
+            "keywords": ["러브버그", "벌레", "곤충"] + [EXTRA_KEYWORDS[j] for j in extra_idx[i]],
+            "image_urls": [],
+        })
     
-    for i in range(50):  # 50개의 테스트 데이터
-        location_data = random.choice(SEOUL_LOCATIONS)
-        
-        # 좌표에 약간의 랜덤성 추가
-        lat = location_data["lat"] + random.uniform(-0.01, 0.01)
-        lng = location_data["lng"] + random.uniform(-0.01, 0.01)
-        
-        # 랜덤 시간 생성 (최근 72시간 내)
-        hours_ago = random.randint(1, 72)
-        created_at = datetime.now() - timedelta(hours=hours_ago)
-        
-        report = LovebugReport(
-            id=f"test_{i+1}",
-            tweet_id=f"tweet_{i+1}",
-            content=random.choice(TEST_MESSAGES),
-            author="테스트사용자" + str(i+1),
-            created_at=created_at,
-            location=Location(
-                latitude=lat,
-                longitude=lng,
-                address=f"{location_data['name']} 일대",
-                district=location_data["district"]
-            ),
-            severity=random.choice(list(SeverityLevel)),
-            platform=random.choice(list(Platform)),
-            keywords=["러브버그", "벌레", "곤충"] + random.sample(["공원", "산책", "외출", "주의", "많음"], 2),
-            sentiment=random.uniform(-1.0, 1.0),
-            image_urls=[],
-            hashtags=["#러브버그", "#벌레주의"],
-            likes=random.randint(0, 100),
-            retweets=random.randint(0, 50),
-            replies=random.randint(0, 20)
-        )
-        
-        test_reports.append(report.dict())
-    
-    # 데이터베이스에 삽입
-    await collection.insert_many(test_reports)
+    # 데이터베이스에 삽입 (무응답 쓰기 + 비순차 배치로 서버가 삽입을 파이프라인 처리)
+    bulk_collection = db.get_collection("lovebug_reports", write_concern=WriteConcern(w=0))
+    await bulk_collection.insert_many(test_reports, ordered=False)
     print(f"{len(test_reports)}개의 테스트 데이터 추가 완료")
     
     # 통계 확인
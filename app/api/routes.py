@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
+import time
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
 
 from app.models.lovebug_data import (
     LovebugReport, LovebugStats, HotSpot, SearchFilter, 
@@ -13,6 +16,69 @@ from app.models.lovebug_data import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 응답 모델(LovebugReport)에 실제로 들어가는 필드만 전송
+# (geo 등 인덱스용 필드와 문서에 남아 있는 잉여 필드 제외)
+REPORT_PROJECTION = {
+    "tweet_id": 1,
+    "platform": 1,
+    "content": 1,
+    "location": 1,
+    "severity": 1,
+    "severity_score": 1,
+    "confidence": 1,
+    "sentiment": 1,
+    "keywords": 1,
+    "image_urls": 1,
+    "author": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+# 쿼리 서킷브레이커: 잘못된 플랜/콜드 캐시로 폭주한 쿼리가 이벤트 루프
+# 코루틴을 무한정 붙잡지 않도록 서버 측 실행 시간 상한을 둠
+FIND_MAX_TIME_MS = 2000
+AGG_MAX_TIME_MS = 5000
+
+# created_at 조회 경로에 강제할 복합 인덱스 (main.create_indexes에서 생성)
+REPORTS_INDEX = [
+    ("created_at", DESCENDING),
+    ("severity", ASCENDING),
+    ("platform", ASCENDING),
+    ("location.district", ASCENDING),
+]
+
+# aggregate의 hint 옵션은 Cursor.hint()와 달리 서버로 그대로 전달되므로
+# (키, 방향) 쌍 리스트가 아니라 인덱스 문서 형태여야 한다
+REPORTS_INDEX_HINT = dict(REPORTS_INDEX)
+
+# 통계성 엔드포인트용 단순 TTL 캐시
+# (대시보드가 같은 파라미터로 반복 조회하는 집계 결과를 30초간 재사용)
+STATS_CACHE_TTL = 30.0
+_stats_cache: Dict[str, Any] = {}
+
+def _cache_get(key: str):
+    """TTL이 지나지 않은 캐시 항목 반환 (만료 항목은 접근 시 제거)"""
+    entry = _stats_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        # 만료된 튜플을 방치하면 키 종류만큼 딕셔너리가 계속 자란다
+        _stats_cache.pop(key, None)
+        return None
+    return entry[1]
+
+def _cache_set(key: str, value: Any):
+    """캐시 항목 저장"""
+    _stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, value)
+
+def _window_start(hours: int) -> datetime:
+    """조회 시작 시각 계산 (분 단위로 내림해 캐시 키가 반복되도록 양자화)
+
+    저장된 created_at이 UTC이므로 비교 기준도 UTC로 맞춘다.
+    """
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    return now - timedelta(hours=hours)
+
 # 데이터베이스 의존성 주입
 async def get_database() -> AsyncIOMotorDatabase:
     """데이터베이스 연결 반환"""
@@ -20,6 +86,19 @@ async def get_database() -> AsyncIOMotorDatabase:
     from app.main import database
     return database
 
+class _ObjectIdToStr(TypeDecoder):
+    """ObjectId를 디코딩 단계에서 바로 문자열로 변환 (문서별 후처리 제거)"""
+    bson_type = ObjectId
+
+    def transform_bson(self, value):
+        return str(value)
+
+_REPORT_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([_ObjectIdToStr()]))
+
+def _reports_collection(db: AsyncIOMotorDatabase):
+    """_id가 문자열로 디코딩되는 보고서 컬렉션 핸들 반환"""
+    return db.get_collection("lovebug_reports", codec_options=_REPORT_CODEC_OPTIONS)
+
 @router.get("/reports", response_model=List[LovebugReport])
 async def get_reports(
     limit: int = Query(100, ge=1, le=1000),
@@ -43,21 +122,24 @@ async def get_reports(
         
         # 시간 필터
         if hours:
-            since = datetime.now() - timedelta(hours=hours)
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
             query["created_at"] = {"$gte": since}
         
-        # 데이터 조회
-        collection = db.lovebug_reports
-        cursor = collection.find(query).sort("created_at", DESCENDING).skip(offset).limit(limit)
-        
-        reports = []
-        async for doc in cursor:
-            # MongoDB ObjectId를 문자열로 변환
-            doc["id"] = str(doc["_id"])
-            del doc["_id"]
-            reports.append(LovebugReport(**doc))
-        
-        return reports
+        # 데이터 조회 (limit 크기의 배치로 한 번에 받아 getMore 왕복 제거)
+        collection = _reports_collection(db)
+        cursor = (
+            collection.find(query, projection=REPORT_PROJECTION, batch_size=limit)
+            .hint(REPORTS_INDEX)
+            .sort("created_at", DESCENDING)
+            .skip(offset)
+            .limit(limit)
+            .max_time_ms(FIND_MAX_TIME_MS)
+        )
+        docs = await cursor.to_list(length=limit)
+
+        # _id는 코덱에서 이미 문자열로 디코딩되며, 방금 저장한 데이터이므로
+        # model_construct로 재검증 없이 모델 생성
+        return [LovebugReport.model_construct(id=doc.pop("_id"), **doc) for doc in docs]
         
     except Exception as e:
         logger.error(f"보고서 조회 중 오류: {str(e)}")
@@ -67,19 +149,24 @@ async def get_reports(
 async def get_report(report_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
     """특정 러브버그 보고서 조회"""
     try:
-        from bson import ObjectId
-        
-        collection = db.lovebug_reports
-        doc = await collection.find_one({"_id": ObjectId(report_id)})
-        
+        collection = _reports_collection(db)
+
+        # ObjectId 형식이면 _id로, 아니면 비즈니스 키(tweet_id)로 조회
+        if ObjectId.is_valid(report_id):
+            query = {"_id": ObjectId(report_id)}
+        else:
+            query = {"tweet_id": report_id}
+
+        doc = await collection.find_one(query, projection=REPORT_PROJECTION, max_time_ms=FIND_MAX_TIME_MS)
+
         if not doc:
             raise HTTPException(status_code=404, detail="보고서를 찾을 수 없습니다.")
-        
-        doc["id"] = str(doc["_id"])
-        del doc["_id"]
-        
-        return LovebugReport(**doc)
-        
+
+        return LovebugReport.model_construct(id=doc.pop("_id"), **doc)
+
+    except HTTPException:
+        # 404가 아래의 일반 예외 처리에 500으로 덮이지 않도록 그대로 전달
+        raise
     except Exception as e:
         logger.error(f"보고서 조회 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="보고서 조회 중 오류가 발생했습니다.")
@@ -91,81 +178,87 @@ async def get_stats(
 ):
     """러브버그 통계 정보 조회"""
     try:
-        since = datetime.now() - timedelta(hours=hours)
+        cache_key = f"stats:{hours}"
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        since = _window_start(hours)
         collection = db.lovebug_reports
-        
-        # 기본 통계
-        total_reports = await collection.count_documents({"created_at": {"$gte": since}})
-        
-        # 시간대별 통계
-        pipeline_hourly = [
-            {"$match": {"created_at": {"$gte": since}}},
-            {"$group": {
-                "_id": {"$hour": "$created_at"},
-                "count": {"$sum": 1}
-            }}
-        ]
-        
-        reports_by_hour = {}
-        async for doc in collection.aggregate(pipeline_hourly):
-            reports_by_hour[doc["_id"]] = doc["count"]
-        
-        # 지역별 통계
-        pipeline_district = [
-            {"$match": {"created_at": {"$gte": since}, "location.district": {"$exists": True}}},
-            {"$group": {
-                "_id": "$location.district",
-                "count": {"$sum": 1}
-            }}
-        ]
-        
-        reports_by_district = {}
-        async for doc in collection.aggregate(pipeline_district):
-            reports_by_district[doc["_id"]] = doc["count"]
-        
-        # 심각도별 통계
-        pipeline_severity = [
+
+        # 단일 $facet 집계로 모든 통계를 한 번에 계산
+        # ($match를 첫 스테이지에 두어 created_at 인덱스를 활용하고,
+        #  시간 윈도우를 여섯 번 재스캔하던 것을 한 번의 스캔으로 줄임)
+        pipeline = [
             {"$match": {"created_at": {"$gte": since}}},
-            {"$group": {
-                "_id": "$severity",
-                "count": {"$sum": 1}
+            {"$facet": {
+                # 지역별 통계
+                "district": [
+                    {"$match": {"location.district": {"$exists": True}}},
+                    {"$group": {
+                        "_id": "$location.district",
+                        "count": {"$sum": 1}
+                    }}
+                ],
+                # 심각도별 통계
+                "severity": [
+                    {"$group": {
+                        "_id": "$severity",
+                        "count": {"$sum": 1}
+                    }}
+                ],
+                # 평균 감정 점수
+                "sentiment": [
+                    {"$group": {
+                        "_id": None,
+                        "avg_sentiment": {"$avg": "$sentiment"}
+                    }}
+                ],
+                # 전체 보고서 수
+                "total": [
+                    {"$count": "n"}
+                ]
             }}
         ]
-        
-        severity_distribution = {}
-        async for doc in collection.aggregate(pipeline_severity):
-            severity_distribution[doc["_id"]] = doc["count"]
-        
-        # 키워드 통계
-        pipeline_keywords = [
-            {"$match": {"created_at": {"$gte": since}}},
-            {"$unwind": "$keywords"},
-            {"$group": {
-                "_id": "$keywords",
-                "count": {"$sum": 1}
-            }},
+
+        results = await collection.aggregate(
+            pipeline, maxTimeMS=AGG_MAX_TIME_MS, allowDiskUse=False, hint=REPORTS_INDEX_HINT
+        ).to_list(length=1)
+        facets = results[0] if results else {}
+
+        # 시간대별 통계는 사전 집계된 hourly_rollups에서 조회
+        # (요청당 비용이 매칭 문서 수가 아닌 시간 버킷 수에 비례)
+        # 버킷 키는 $dateTrunc 기준 ISO 시각 — 0~23시로 접으면 72시간 윈도우에서
+        # 서로 다른 날짜의 같은 시각이 한 버킷에 합쳐지는 문제가 있었음
+        rollup_docs = await db.hourly_rollups.find({"_id": {"$gte": since}}).sort("_id", 1).max_time_ms(FIND_MAX_TIME_MS).to_list(length=None)
+        reports_by_hour: Dict[str, int] = {
+            doc["_id"].isoformat(): doc["count"] for doc in rollup_docs
+        }
+
+        # 인기 키워드는 사전 집계된 keyword_hourly_counts에서 조회
+        # (보고서 전체에 대한 $unwind 문서 증폭 제거 — 작은 집계 컬렉션만 스캔)
+        keyword_pipeline = [
+            {"$match": {"_id.bucket": {"$gte": since}}},
+            {"$group": {"_id": "$_id.keyword", "count": {"$sum": "$count"}}},
             {"$sort": {"count": -1}},
             {"$limit": 10}
         ]
-        
-        top_keywords = []
-        async for doc in collection.aggregate(pipeline_keywords):
-            top_keywords.append({"keyword": doc["_id"], "count": doc["count"]})
-        
-        # 평균 감정 점수
-        pipeline_sentiment = [
-            {"$match": {"created_at": {"$gte": since}}},
-            {"$group": {
-                "_id": None,
-                "avg_sentiment": {"$avg": "$sentiment"}
-            }}
+        keyword_docs = await db.keyword_hourly_counts.aggregate(
+            keyword_pipeline, maxTimeMS=AGG_MAX_TIME_MS
+        ).to_list(length=10)
+
+        total_reports = facets["total"][0]["n"] if facets.get("total") else 0
+        reports_by_district = {doc["_id"]: doc["count"] for doc in facets.get("district", [])}
+        severity_distribution = {doc["_id"]: doc["count"] for doc in facets.get("severity", [])}
+        top_keywords = [
+            {"keyword": doc["_id"], "count": doc["count"]}
+            for doc in keyword_docs
         ]
-        
         average_sentiment = 0.0
-        async for doc in collection.aggregate(pipeline_sentiment):
-            average_sentiment = doc["avg_sentiment"] or 0.0
-        
-        return LovebugStats(
+        if facets.get("sentiment"):
+            average_sentiment = facets["sentiment"][0]["avg_sentiment"] or 0.0
+
+        stats = LovebugStats(
             total_reports=total_reports,
             reports_by_hour=reports_by_hour,
             reports_by_district=reports_by_district,
@@ -174,7 +267,9 @@ async def get_stats(
             average_sentiment=average_sentiment,
             last_updated=datetime.now()
         )
-        
+        _cache_set(cache_key, stats)
+        return stats
+
     except Exception as e:
         logger.error(f"통계 조회 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="통계 조회 중 오류가 발생했습니다.")
@@ -188,7 +283,15 @@ async def get_hotspots(
 ):
     """러브버그 핫스팟 조회"""
     try:
-        since = datetime.now() - timedelta(hours=hours)
+        # 클라이언트가 보낸 임의의 실수가 그대로 캐시 키가 되면 키 공간이
+        # 쿼리스트링 입력만큼 무한히 늘어나므로 0.1km 단위로 양자화
+        radius = round(radius, 1)
+        cache_key = f"hotspots:{hours}:{limit}:{radius}"
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        since = _window_start(hours)
         collection = db.lovebug_reports
         
         # 위치 정보가 있는 보고서들을 그룹화
@@ -197,6 +300,8 @@ async def get_hotspots(
                 "created_at": {"$gte": since},
                 "location": {"$exists": True}
             }},
+            # 그룹화 전에 필요한 필드만 남겨 문서 크기 축소
+            {"$project": {"location": 1, "severity_score": 1, "created_at": 1}},
             {"$group": {
                 "_id": {
                     "district": "$location.district",
@@ -204,38 +309,37 @@ async def get_hotspots(
                     "lng": {"$round": ["$location.longitude", 2]}
                 },
                 "count": {"$sum": 1},
-                "avg_severity": {"$avg": {"$switch": {
-                    "branches": [
-                        {"case": {"$eq": ["$severity", "low"]}, "then": 1},
-                        {"case": {"$eq": ["$severity", "medium"]}, "then": 2},
-                        {"case": {"$eq": ["$severity", "high"]}, "then": 3},
-                        {"case": {"$eq": ["$severity", "critical"]}, "then": 4}
-                    ],
-                    "default": 1
-                }}},
+                "avg_severity": {"$avg": "$severity_score"},
                 "last_activity": {"$max": "$created_at"}
             }},
+            # 최소 2개 이상의 보고서가 있는 그룹만 (파이프라인 안에서 걸러야
+            # 상위 limit개가 싱글톤으로 채워져 응답이 모자라는 일이 없음)
+            {"$match": {"count": {"$gte": 2}}},
             {"$sort": {"count": -1}},
             {"$limit": limit}
         ]
-        
-        hotspots = []
-        async for doc in collection.aggregate(pipeline):
-            if doc["count"] >= 2:  # 최소 2개 이상의 보고서가 있는 경우만
-                hotspots.append(HotSpot(
-                    location=Location(
-                        latitude=doc["_id"]["lat"],
-                        longitude=doc["_id"]["lng"],
-                        district=doc["_id"]["district"]
-                    ),
-                    report_count=doc["count"],
-                    average_severity=doc["avg_severity"],
-                    radius=radius,
-                    last_activity=doc["last_activity"]
-                ))
-        
+
+        docs = await collection.aggregate(
+            pipeline, batchSize=limit, maxTimeMS=AGG_MAX_TIME_MS, allowDiskUse=False, hint=REPORTS_INDEX_HINT
+        ).to_list(length=limit)
+
+        hotspots = [
+            HotSpot(
+                location=Location(
+                    latitude=doc["_id"]["lat"],
+                    longitude=doc["_id"]["lng"],
+                    district=doc["_id"]["district"]
+                ),
+                report_count=doc["count"],
+                average_severity=doc["avg_severity"],
+                radius=radius,
+                last_activity=doc["last_activity"]
+            )
+            for doc in docs
+        ]
+        _cache_set(cache_key, hotspots)
         return hotspots
-        
+
     except Exception as e:
         logger.error(f"핫스팟 조회 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="핫스팟 조회 중 오류가 발생했습니다.")
@@ -256,12 +360,9 @@ async def search_reports(
     try:
         query = {}
         
-        # 키워드 검색
+        # 키워드 검색 (텍스트 인덱스 사용 — 비앵커 $regex의 전체 스캔 방지)
         if keyword:
-            query["$or"] = [
-                {"content": {"$regex": keyword, "$options": "i"}},
-                {"keywords": {"$in": [keyword]}}
-            ]
+            query["$text"] = {"$search": keyword}
         
         # 심각도 필터
         if severity:
@@ -273,33 +374,34 @@ async def search_reports(
         
         # 시간 필터
         if hours:
-            since = datetime.now() - timedelta(hours=hours)
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
             query["created_at"] = {"$gte": since}
         
-        # 위치 필터 (간단한 bounding box)
-        if latitude and longitude and radius:
-            lat_range = radius / 111.0  # 대략적인 위도 변환
-            lng_range = radius / (111.0 * abs(latitude))  # 대략적인 경도 변환
-            
-            query["location.latitude"] = {
-                "$gte": latitude - lat_range,
-                "$lte": latitude + lat_range
-            }
-            query["location.longitude"] = {
-                "$gte": longitude - lng_range,
-                "$lte": longitude + lng_range
+        # 위치 필터 (2dsphere 인덱스 기반 반경 검색)
+        if latitude is not None and longitude is not None and radius:
+            query["geo"] = {
+                "$geoWithin": {
+                    # 반경(km)을 지구 반지름(km) 기준 라디안으로 변환
+                    "$centerSphere": [[longitude, latitude], radius / 6378.1]
+                }
             }
         
-        collection = db.lovebug_reports
-        cursor = collection.find(query).sort("created_at", DESCENDING).limit(limit)
-        
-        reports = []
-        async for doc in cursor:
-            doc["id"] = str(doc["_id"])
-            del doc["_id"]
-            reports.append(LovebugReport(**doc))
-        
-        return reports
+        collection = _reports_collection(db)
+        cursor = collection.find(query, projection=REPORT_PROJECTION, batch_size=limit).sort("created_at", DESCENDING).limit(limit).max_time_ms(FIND_MAX_TIME_MS)
+        docs = await cursor.to_list(length=limit)
+
+        # 조사가 붙은 한국어 본문은 공백 토큰 기반 텍스트 인덱스에 걸리지 않을 수
+        # 있으므로, 결과가 없으면 기존 정규식 검색으로 폴백
+        if keyword and not docs:
+            del query["$text"]
+            query["$or"] = [
+                {"content": {"$regex": keyword, "$options": "i"}},
+                {"keywords": {"$in": [keyword]}}
+            ]
+            cursor = collection.find(query, projection=REPORT_PROJECTION, batch_size=limit).sort("created_at", DESCENDING).limit(limit).max_time_ms(FIND_MAX_TIME_MS)
+            docs = await cursor.to_list(length=limit)
+
+        return [LovebugReport.model_construct(id=doc.pop("_id"), **doc) for doc in docs]
         
     except Exception as e:
         logger.error(f"보고서 검색 중 오류: {str(e)}")
@@ -312,7 +414,12 @@ async def get_districts(
 ):
     """지역별 러브버그 현황 조회"""
     try:
-        since = datetime.now() - timedelta(hours=hours)
+        cache_key = f"districts:{hours}"
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        since = _window_start(hours)
         collection = db.lovebug_reports
         
         pipeline = [
@@ -320,32 +427,31 @@ async def get_districts(
                 "created_at": {"$gte": since},
                 "location.district": {"$exists": True}
             }},
+            # 그룹화 전에 필요한 필드만 남겨 문서 크기 축소
+            {"$project": {"location.district": 1, "severity_score": 1, "created_at": 1}},
             {"$group": {
                 "_id": "$location.district",
                 "count": {"$sum": 1},
-                "avg_severity": {"$avg": {"$switch": {
-                    "branches": [
-                        {"case": {"$eq": ["$severity", "low"]}, "then": 1},
-                        {"case": {"$eq": ["$severity", "medium"]}, "then": 2},
-                        {"case": {"$eq": ["$severity", "high"]}, "then": 3},
-                        {"case": {"$eq": ["$severity", "critical"]}, "then": 4}
-                    ],
-                    "default": 1
-                }}},
+                "avg_severity": {"$avg": "$severity_score"},
                 "last_activity": {"$max": "$created_at"}
             }},
             {"$sort": {"count": -1}}
         ]
         
-        districts = []
-        async for doc in collection.aggregate(pipeline):
-            districts.append({
+        docs = await collection.aggregate(
+            pipeline, batchSize=500, maxTimeMS=AGG_MAX_TIME_MS, allowDiskUse=False, hint=REPORTS_INDEX_HINT
+        ).to_list(length=None)
+
+        districts = [
+            {
                 "district": doc["_id"],
                 "count": doc["count"],
                 "average_severity": doc["avg_severity"],
                 "last_activity": doc["last_activity"]
-            })
-        
+            }
+            for doc in docs
+        ]
+        _cache_set(cache_key, districts)
         return districts
         
     except Exception as e:
@@ -4,12 +4,12 @@ import tweepy
 from bs4 import BeautifulSoup
 import re
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
 import os
 from dataclasses import dataclass
 
-from app.models.lovebug_data import LovebugReport, Platform, SeverityLevel, Location
+from app.models.lovebug_data import LovebugReport, Platform, SeverityLevel, Location, SEVERITY_SCORES
 from app.utils.text_analyzer import TextAnalyzer
 from app.utils.location_extractor import LocationExtractor
 
@@ -33,21 +33,45 @@ class TwitterCrawler:
         self.location_extractor = LocationExtractor()
         
         # 러브버그 관련 키워드
-        self.lovebug_keywords = [
+        self.lovebug_keywords = (
             "러브버그", "붉은등우단털파리", "서울 벌레", "빨간벌레",
             "차에 붙은 벌레", "파리 떼", "벌레 많아", "벌레 지옥",
             "플레인 파리", "러브버그 습격", "벌레 떼거리"
-        ]
-        
+        )
+
+        # 위치/심각도 패턴은 한 번만 컴파일해 두고 트윗마다 재사용
+        self._location_re = re.compile(r'([가-힣]+(?:역|구|동|로|거리))')
+        self._severity_patterns = (
+            (SeverityLevel.CRITICAL, re.compile("지옥|떼거리|엄청|미친|완전")),
+            (SeverityLevel.HIGH, re.compile("많아|진짜|심해|대박")),
+            (SeverityLevel.MEDIUM, re.compile("좀|꽤|조금")),
+        )
+
         # 트위터 API 설정 (환경변수에서 읽기)
         self.bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
         if not self.bearer_token:
             logger.warning("트위터 API 토큰이 설정되지 않았습니다. 웹 스크래핑 모드로 실행됩니다.")
+
+        # 크롤러 수명 동안 재사용하는 클라이언트/세션
+        # (호출마다 TCP+TLS 핸드셰이크를 반복하지 않도록 keep-alive 풀 유지)
+        self._tw_client = tweepy.Client(bearer_token=self.bearer_token) if self.bearer_token else None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """공유 aiohttp 세션 반환 (첫 사용 시 생성)"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._http_session
+
+    async def aclose(self):
+        """크롤러가 보유한 네트워크 자원 정리"""
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
     
     async def crawl_lovebug_tweets(self) -> List[LovebugReport]:
         """러브버그 관련 트윗 크롤링"""
-        reports = []
-        
         try:
             if self.bearer_token:
                 # 공식 API 사용
@@ -55,35 +79,58 @@ class TwitterCrawler:
             else:
                 # 웹 스크래핑 사용 (제한적)
                 tweets = await self._crawl_with_scraping()
-            
-            # 각 트윗을 분석하여 LovebugReport로 변환
-            for tweet_data in tweets:
-                report = await self._process_tweet(tweet_data)
-                if report:
-                    reports.append(report)
-            
+
+            # 매핑에 없는 지명은 먼저 비동기 지오코더로 해석해 캐시를 채움
+            # (이후 분석 단계는 네트워크 호출 없이 캐시만 읽음)
+            await self.location_extractor.resolve_unmapped_locations(
+                [tweet_data.text for tweet_data in tweets]
+            )
+
+            # CPU 바운드인 분석/변환은 워커 스레드로 넘겨 이벤트 루프가
+            # 웹소켓 하트비트 등 다른 태스크를 계속 처리할 수 있게 한다
+            reports = await asyncio.to_thread(self._analyze_batch, tweets)
+
             logger.info(f"총 {len(reports)}개의 러브버그 보고서 생성됨")
             return reports
-            
+
         except Exception as e:
             logger.error(f"트위터 크롤링 중 오류 발생: {str(e)}")
             return []
-    
+
+    def _analyze_batch(self, tweets: List[TweetData]) -> List[LovebugReport]:
+        """트윗 배치를 분석해 보고서로 변환 (CPU 바운드, 워커 스레드에서 실행)"""
+        # 분석기는 트윗별이 아니라 배치당 한 번씩만 호출
+        texts = [tweet_data.text for tweet_data in tweets]
+        analyses = self.text_analyzer.analyze_texts(texts)
+        locations = self.location_extractor.extract_locations(texts)
+
+        # 시계 조회는 배치당 한 번 (트윗마다 datetime.now() 호출 방지)
+        now = datetime.now(timezone.utc)
+
+        reports = []
+        for tweet_data, analysis, location in zip(tweets, analyses, locations):
+            report = self._build_report(tweet_data, analysis, location, now)
+            if report:
+                reports.append(report)
+        return reports
+
     async def _crawl_with_api(self) -> List[TweetData]:
         """트위터 API를 사용한 크롤링"""
-        tweets = []
-        
         try:
-            # Tweepy 클라이언트 설정
-            client = tweepy.Client(bearer_token=self.bearer_token)
-            
-            # 각 키워드로 검색
-            for keyword in self.lovebug_keywords:
-                try:
-                    # 최근 24시간 내 트윗 검색
-                    since_time = datetime.now() - timedelta(hours=24)
-                    
-                    response = client.search_recent_tweets(
+            # 공유 Tweepy 클라이언트 재사용
+            client = self._tw_client
+
+            # 최근 24시간 내 트윗 검색 (트위터 API는 UTC 기준)
+            since_time = datetime.now(timezone.utc) - timedelta(hours=24)
+
+            # API 호출 제한을 위해 동시 검색 수 제한
+            semaphore = asyncio.Semaphore(5)
+
+            async def search_keyword(keyword: str):
+                # 동기 Tweepy 호출이 이벤트 루프를 막지 않도록 스레드에서 실행
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        client.search_recent_tweets,
                         query=f"{keyword} -is:retweet lang:ko",
                         max_results=10,
                         tweet_fields=['created_at', 'author_id', 'geo', 'attachments'],
@@ -92,49 +139,62 @@ class TwitterCrawler:
                         media_fields=['url'],
                         start_time=since_time
                     )
-                    
-                    if response.data:
-                        for tweet in response.data:
-                            # 사용자 정보 찾기
-                            author = "Unknown"
-                            if response.includes and 'users' in response.includes:
-                                for user in response.includes['users']:
-                                    if user.id == tweet.author_id:
-                                        author = user.username
-                                        break
-                            
-                            # 이미지 URL 추출
-                            images = []
-                            if hasattr(tweet, 'attachments') and tweet.attachments:
-                                if 'media_keys' in tweet.attachments:
-                                    if response.includes and 'media' in response.includes:
-                                        for media in response.includes['media']:
-                                            if media.media_key in tweet.attachments['media_keys']:
-                                                if hasattr(media, 'url'):
-                                                    images.append(media.url)
-                            
-                            tweet_data = TweetData(
-                                id=tweet.id,
-                                text=tweet.text,
-                                author=author,
-                                created_at=tweet.created_at,
-                                images=images,
-                                location=getattr(tweet, 'geo', None)
-                            )
-                            tweets.append(tweet_data)
-                    
-                    # API 호출 제한을 위한 딜레이
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.warning(f"키워드 '{keyword}' 검색 중 오류: {str(e)}")
+
+            # 키워드별 검색을 병렬로 수행
+            responses = await asyncio.gather(
+                *(search_keyword(keyword) for keyword in self.lovebug_keywords),
+                return_exceptions=True
+            )
+
+            tweets = []
+            for keyword, response in zip(self.lovebug_keywords, responses):
+                if isinstance(response, BaseException):
+                    logger.warning(f"키워드 '{keyword}' 검색 중 오류: {str(response)}")
                     continue
-            
+                tweets.extend(self._parse_search_response(response))
+
             return tweets
-            
+
         except Exception as e:
             logger.error(f"트위터 API 크롤링 오류: {str(e)}")
             return []
+
+    def _parse_search_response(self, response) -> List[TweetData]:
+        """검색 응답을 TweetData 목록으로 변환"""
+        tweets = []
+
+        if not response.data:
+            return tweets
+
+        for tweet in response.data:
+            # 사용자 정보 찾기
+            author = "Unknown"
+            if response.includes and 'users' in response.includes:
+                for user in response.includes['users']:
+                    if user.id == tweet.author_id:
+                        author = user.username
+                        break
+
+            # 이미지 URL 추출
+            images = []
+            if hasattr(tweet, 'attachments') and tweet.attachments:
+                if 'media_keys' in tweet.attachments:
+                    if response.includes and 'media' in response.includes:
+                        for media in response.includes['media']:
+                            if media.media_key in tweet.attachments['media_keys']:
+                                if hasattr(media, 'url'):
+                                    images.append(media.url)
+
+            tweets.append(TweetData(
+                id=tweet.id,
+                text=tweet.text,
+                author=author,
+                created_at=tweet.created_at,
+                images=images,
+                location=getattr(tweet, 'geo', None)
+            ))
+
+        return tweets
     
     async def _crawl_with_scraping(self) -> List[TweetData]:
         """웹 스크래핑을 통한 크롤링 (제한적)"""
@@ -178,34 +238,41 @@ class TwitterCrawler:
             logger.error(f"웹 스크래핑 오류: {str(e)}")
             return []
     
-    async def _process_tweet(self, tweet_data: TweetData) -> Optional[LovebugReport]:
-        """트윗 데이터를 LovebugReport로 변환"""
+    def _build_report(
+        self,
+        tweet_data: TweetData,
+        analysis: Dict[str, Any],
+        location: Optional[Location],
+        now: datetime
+    ) -> Optional[LovebugReport]:
+        """배치 분석 결과로 트윗 데이터를 LovebugReport로 변환"""
         try:
-            # 텍스트 분석
-            analysis = await self.text_analyzer.analyze_text(tweet_data.text)
-            
-            # 위치 추출
-            location = await self.location_extractor.extract_location(tweet_data.text)
-            
             # 심각도 판단
             severity = self._determine_severity(tweet_data.text, analysis)
             
             # 키워드 추출
             keywords = self._extract_keywords(tweet_data.text)
-            
+
+            # 2dsphere 인덱스용 GeoJSON 포인트
+            geo = None
+            if location:
+                geo = {"type": "Point", "coordinates": [location.longitude, location.latitude]}
+
             report = LovebugReport(
                 tweet_id=tweet_data.id,
                 platform=Platform.TWITTER,
                 content=tweet_data.text,
                 location=location,
+                geo=geo,
                 severity=severity,
+                severity_score=SEVERITY_SCORES[severity],
                 confidence=analysis.get('confidence', 0.7),
                 sentiment=analysis.get('sentiment', 0.0),
                 keywords=keywords,
                 image_urls=tweet_data.images,
                 author=tweet_data.author,
                 created_at=tweet_data.created_at,
-                updated_at=datetime.now()
+                updated_at=now
             )
             
             return report
@@ -217,34 +284,21 @@ class TwitterCrawler:
     def _determine_severity(self, text: str, analysis: Dict[str, Any]) -> SeverityLevel:
         """텍스트 내용을 바탕으로 심각도 판단"""
         text_lower = text.lower()
-        
-        # 키워드 기반 심각도 판단
-        if any(word in text_lower for word in ['지옥', '떼거리', '엄청', '미친', '완전']):
-            return SeverityLevel.CRITICAL
-        elif any(word in text_lower for word in ['많아', '진짜', '심해', '대박']):
-            return SeverityLevel.HIGH
-        elif any(word in text_lower for word in ['좀', '꽤', '조금']):
-            return SeverityLevel.MEDIUM
-        else:
-            return SeverityLevel.LOW
-    
+
+        # 키워드 기반 심각도 판단 (높은 단계부터 확인)
+        for severity, pattern in self._severity_patterns:
+            if pattern.search(text_lower):
+                return severity
+        return SeverityLevel.LOW
+
     def _extract_keywords(self, text: str) -> List[str]:
         """텍스트에서 키워드 추출"""
-        keywords = []
-        
-        # 기본 러브버그 키워드 확인
-        for keyword in self.lovebug_keywords:
-            if keyword in text:
-                keywords.append(keyword)
-        
+        # 기본 러브버그 키워드 확인 — 키워드별 substring 검색 유지
+        # (정규식 얼터네이션은 첫 번째 대안만 잡아 '러브버그 습격'처럼
+        #  겹치는 키워드를 놓침; 11개 키워드의 in 검색은 충분히 저렴)
+        keywords = {keyword for keyword in self.lovebug_keywords if keyword in text}
+
         # 위치 관련 키워드 추출
-        location_patterns = [
-            r'([가-힣]+역)', r'([가-힣]+구)', r'([가-힣]+동)', 
-            r'([가-힣]+로)', r'([가-힣]+거리)'
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            keywords.extend(matches)
-        
-        return list(set(keywords))  # 중복 제거
\ No newline at end of file
+        keywords.update(self._location_re.findall(text))
+
+        return list(keywords)  # 중복 제거
\ No newline at end of file
@@ -4,12 +4,13 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import asyncio
 import json
 from typing import List, Dict, Any
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 
 from app.models.lovebug_data import LovebugReport, LovebugStats
@@ -29,24 +30,135 @@ logger = logging.getLogger(__name__)
 mongodb_client = None
 database = None
 scheduler = None
+crawler = None
 websocket_manager = WebSocketManager()
 
+async def refresh_hourly_rollups(hours: int = 25):
+    """시간 버킷별 통계를 hourly_rollups 컬렉션으로 사전 집계
+
+    최근 N시간 범위만 다시 계산하며, $merge의 replace 동작으로 버킷 단위
+    재계산이 멱등이 되도록 한다. /stats의 시간대별 통계가 이 컬렉션을
+    읽으므로 요청당 비용이 문서 수가 아닌 버킷 수에 비례하게 된다.
+
+    기본 윈도우(25시간)는 크롤러의 수집 범위를 덮어야 한다 — 크롤러는
+    최대 24시간 전에 작성된 트윗을 지금 수집하므로, 그보다 좁은 윈도우는
+    늦게 도착한 보고서의 버킷을 영영 재계산하지 않는다. (+1시간은
+    경계 버킷 여유분)
+    """
+    try:
+        collection = database.lovebug_reports
+        # 시간 경계로 내림 — 그렇지 않으면 윈도우의 가장 오래된 버킷이
+        # 해당 시간의 일부 구간만으로 재계산되고 $merge replace가
+        # 기존의 온전한 카운트를 덮어써 버킷이 영구적으로 과소집계된다
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        since = now - timedelta(hours=hours)
+
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$group": {
+                "_id": {"$dateTrunc": {"date": "$created_at", "unit": "hour"}},
+                "count": {"$sum": 1},
+                "avg_severity": {"$avg": "$severity_score"}
+            }},
+            {"$merge": {
+                "into": "hourly_rollups",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }}
+        ]
+
+        await collection.aggregate(pipeline).to_list(length=None)
+
+        # 키워드별 시간 버킷 집계
+        # ($unwind의 문서 증폭을 전체 윈도우가 아닌 최근 범위로만 한정)
+        keyword_pipeline = [
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$project": {"keywords": 1, "created_at": 1}},
+            {"$unwind": "$keywords"},
+            {"$group": {
+                "_id": {
+                    "bucket": {"$dateTrunc": {"date": "$created_at", "unit": "hour"}},
+                    "keyword": "$keywords"
+                },
+                "count": {"$sum": 1}
+            }},
+            {"$merge": {
+                "into": "keyword_hourly_counts",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }}
+        ]
+
+        await collection.aggregate(keyword_pipeline).to_list(length=None)
+        logger.debug("hourly_rollups 갱신 완료")
+
+    except Exception as e:
+        logger.error(f"hourly_rollups 갱신 중 오류 발생: {str(e)}")
+
+async def create_indexes():
+    """조회 경로에서 사용하는 인덱스 생성"""
+    collection = database.lovebug_reports
+
+    # created_at 필터 + 정렬을 인덱스 스캔으로 처리 (COLLSCAN + 메모리 정렬 방지)
+    await collection.create_index([
+        ("created_at", DESCENDING),
+        ("severity", ASCENDING),
+        ("platform", ASCENDING),
+        ("location.district", ASCENDING)
+    ])
+
+    # 지역별 통계/현황 조회용
+    await collection.create_index([
+        ("location.district", ASCENDING),
+        ("created_at", DESCENDING)
+    ])
+
+    # 키워드 $in / $unwind 경로용
+    await collection.create_index([("keywords", ASCENDING)])
+
+    # 비즈니스 키(tweet_id) 조회/업서트용
+    await collection.create_index(
+        [("tweet_id", ASCENDING)],
+        unique=True,
+        partialFilterExpression={"tweet_id": {"$type": "string"}}
+    )
+
+    # 반경 검색용 2dsphere 인덱스 (GeoJSON geo 필드)
+    await collection.create_index([("geo", "2dsphere")])
+
+    # 키워드 검색용 텍스트 인덱스
+    # (한국어 형태소 분석은 지원되지 않아 공백 토큰 기준으로 동작)
+    await collection.create_index(
+        [("content", "text"), ("keywords", "text")],
+        default_language="none"
+    )
+
+    logger.info("MongoDB 인덱스 생성 완료")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 라이프사이클 관리"""
     # 시작 시 실행
-    global mongodb_client, database, scheduler
+    global mongodb_client, database, scheduler, crawler
     
     # MongoDB 연결
     MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     mongodb_client = AsyncIOMotorClient(MONGODB_URL)
     database = mongodb_client.lovebug_map
-    
+
+    # 인덱스 생성
+    try:
+        await create_indexes()
+    except Exception as e:
+        logger.error(f"인덱스 생성 중 오류 발생: {str(e)}")
+
     # 스케줄러 시작
     scheduler = AsyncIOScheduler()
     
     # 10분마다 크롤링 작업 스케줄링
     crawler = TwitterCrawler()
+    # 지오코딩용 공유 HTTP 세션 준비
+    await crawler.location_extractor.startup()
     scheduler.add_job(
         crawl_and_update,
         'interval',
@@ -55,7 +167,22 @@ async def lifespan(app: FastAPI):
         kwargs={'crawler': crawler}
     )
     
+    # 5분마다 시간대별 통계 롤업 갱신
+    scheduler.add_job(
+        refresh_hourly_rollups,
+        'interval',
+        minutes=5,
+        id='hourly_rollups'
+    )
+
     scheduler.start()
+
+    # 시작 시 통계 조회 가능한 전체 윈도우(168시간)를 한 번 백필
+    try:
+        await refresh_hourly_rollups(hours=168)
+    except Exception as e:
+        logger.error(f"hourly_rollups 백필 중 오류 발생: {str(e)}")
+
     logger.info("러브버그 맵 백엔드 시작됨")
     
     yield
@@ -63,6 +190,9 @@ async def lifespan(app: FastAPI):
     # 종료 시 실행
     if scheduler:
         scheduler.shutdown()
+    if crawler:
+        await crawler.aclose()
+        await crawler.location_extractor.aclose()
     if mongodb_client:
         mongodb_client.close()
     logger.info("러브버그 맵 백엔드 종료됨")
@@ -102,19 +232,26 @@ async def crawl_and_update(crawler: TwitterCrawler):
         # 데이터베이스에 저장
         if reports:
             collection = database.lovebug_reports
-            for report in reports:
-                await collection.update_one(
-                    {"tweet_id": report.tweet_id},
-                    {"$set": report.dict()},
-                    upsert=True
-                )
-            
+
+            # 직렬화는 한 번만 수행해 DB 쓰기와 브로드캐스트에 재사용
+            # (mode="json"이 아닌 기본 덤프 — Mongo에는 datetime을
+            #  네이티브 타입 그대로 저장해야 범위 쿼리/인덱스가 동작)
+            payloads = [report.model_dump() for report in reports]
+
+            # 문서당 한 번의 왕복 대신 단일 bulk_write 배치로 업서트
+            # (tweet_id 업서트 키는 create_indexes의 유니크 인덱스가 지원)
+            ops = [
+                UpdateOne({"tweet_id": payload["tweet_id"]}, {"$set": payload}, upsert=True)
+                for payload in payloads
+            ]
+            await collection.bulk_write(ops, ordered=False)
+
             logger.info(f"{len(reports)}개의 러브버그 보고서 업데이트됨")
-            
+
             # 웹소켓을 통해 클라이언트에게 실시간 업데이트 전송
             await websocket_manager.broadcast({
                 "type": "lovebug_update",
-                "data": [report.dict() for report in reports]
+                "data": payloads
             })
         
     except Exception as e:
@@ -173,5 +310,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=False,  # 프로덕션에서는 reload 비활성화
+        loop="uvloop",  # asyncio 기본 루프보다 빠른 이벤트 루프
+        http="httptools",  # C 구현 HTTP 파서
         log_level="info"
     )
\ No newline at end of file
@@ -10,6 +10,14 @@ class SeverityLevel(str, Enum):
     HIGH = "high"        # 많음
     CRITICAL = "critical" # 매우 많음
 
+# 심각도 → 숫자 점수 매핑 (집계 시 $switch 대신 사용)
+SEVERITY_SCORES: Dict[SeverityLevel, int] = {
+    SeverityLevel.LOW: 1,
+    SeverityLevel.MEDIUM: 2,
+    SeverityLevel.HIGH: 3,
+    SeverityLevel.CRITICAL: 4,
+}
+
 class Platform(str, Enum):
     """SNS 플랫폼 타입"""
     TWITTER = "twitter"
@@ -32,7 +40,9 @@ class LovebugReport(BaseModel):
     platform: Platform = Field(..., description="플랫폼")
     content: str = Field(..., description="원본 텍스트")
     location: Optional[Location] = Field(None, description="위치 정보")
+    geo: Optional[Dict[str, Any]] = Field(None, description="GeoJSON Point (2dsphere 인덱스용)")
     severity: SeverityLevel = Field(SeverityLevel.LOW, description="심각도")
+    severity_score: int = Field(1, description="심각도 숫자 점수 (1-4, 집계용)")
     confidence: float = Field(0.0, description="신뢰도 점수 (0.0-1.0)")
     sentiment: float = Field(0.0, description="감정 점수 (-1.0 ~ 1.0)")
     keywords: List[str] = Field(default_factory=list, description="추출된 키워드")
@@ -40,16 +50,11 @@ class LovebugReport(BaseModel):
     author: Optional[str] = Field(None, description="작성자")
     created_at: datetime = Field(default_factory=datetime.now, description="생성 시간")
     updated_at: datetime = Field(default_factory=datetime.now, description="업데이트 시간")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class LovebugStats(BaseModel):
     """러브버그 통계 모델"""
     total_reports: int = Field(0, description="전체 보고서 수")
-    reports_by_hour: Dict[int, int] = Field(default_factory=dict, description="시간대별 보고서 수")
+    reports_by_hour: Dict[str, int] = Field(default_factory=dict, description="시간 버킷(ISO 시각)별 보고서 수")
     reports_by_district: Dict[str, int] = Field(default_factory=dict, description="지역별 보고서 수")
     severity_distribution: Dict[SeverityLevel, int] = Field(default_factory=dict, description="심각도별 분포")
     top_keywords: List[Dict[str, Any]] = Field(default_factory=list, description="인기 키워드")
@@ -0,0 +1,13 @@
+"""한국어 지명 매칭용 공용 정규식
+
+TextAnalyzer와 LocationExtractor가 각자 들고 있던 위치 패턴을
+한 곳에서 컴파일해 공유한다. (컴파일 1회, 수정 지점 1곳)
+"""
+import re
+
+# 접미사별 패턴을 하나의 얼터네이션으로 합쳐 텍스트를 한 번만 스캔
+# 후행 조사/문맥은 필수 — 선택 매칭으로 두면 '운동', '자동'처럼
+# 접미사 글자를 우연히 포함한 일반 단어까지 지명으로 오인한다
+LOCATION_RE = re.compile(
+    r'([가-힣]+(?:역|구|동|로|거리|공원|대학교?|시장|병원))\s*(?:에서?|근처|앞|일대)'
+)
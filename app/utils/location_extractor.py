@@ -1,139 +1,290 @@
+import os
 import re
+import zlib
 import asyncio
 import aiohttp
-from typing import Optional, Dict, Any, List
+import numpy as np
+from functools import lru_cache
+from typing import Optional, Dict, Any, Final, List, Tuple
 import logging
 from app.models.lovebug_data import Location
+from app.utils.korean_patterns import LOCATION_RE
+
+try:
+    import ahocorasick
+except ImportError:  # 선택 의존성 — 없으면 지명별 substring 스캔으로 폴백
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# 구/군, 시/도 패턴
+_DISTRICT_RE = re.compile(r'([가-힣]+구|[가-힣]+군)')
+_CITY_RE = re.compile(r'([가-힣]+시|[가-힣]+도|[가-힣]+특별시|[가-힣]+광역시)')
+
+@lru_cache(maxsize=1024)
+def _estimated_coordinates(location_name: str) -> Tuple[float, float]:
+    """매핑에 없는 지명의 추정 좌표 (서울 중심 근처)
+
+    내장 hash()는 프로세스마다 시드가 달라 재시작 시 같은 지명이 다른
+    좌표를 받으므로, CRC32 기반의 결정적 오프셋을 사용하고 지명별로
+    캐시한다. (실제로는 외부 지오코딩 API 사용)
+    """
+    offset = (zlib.crc32(location_name.encode('utf-8')) % 1000) / 10000
+    return 37.5665 + offset, 126.9780 + offset
+
+# 주요 지역 좌표 매핑 (서울 중심) — 임포트 시 한 번만 생성해 읽기 전용으로 공유
+_LOCATION_MAPPING: Final[Dict[str, Dict[str, Any]]] = {
+    # 서울 주요 역/지역
+    '강남역': {'lat': 37.4979, 'lng': 127.0276, 'address': '서울특별시 강남구 강남대로 지하396'},
+    '홍대': {'lat': 37.5516, 'lng': 126.9226, 'address': '서울특별시 마포구 홍익로'},
+    '홍대입구역': {'lat': 37.5516, 'lng': 126.9226, 'address': '서울특별시 마포구 홍익로'},
+    '신촌': {'lat': 37.5596, 'lng': 126.9361, 'address': '서울특별시 서대문구 신촌동'},
+    '신촌역': {'lat': 37.5596, 'lng': 126.9361, 'address': '서울특별시 서대문구 신촌동'},
+    '명동': {'lat': 37.5636, 'lng': 126.9826, 'address': '서울특별시 중구 명동'},
+    '명동역': {'lat': 37.5636, 'lng': 126.9826, 'address': '서울특별시 중구 명동'},
+    '종로': {'lat': 37.5704, 'lng': 126.9826, 'address': '서울특별시 종로구 종로'},
+    '종로3가역': {'lat': 37.5704, 'lng': 126.9826, 'address': '서울특별시 종로구 종로'},
+    '이태원': {'lat': 37.5346, 'lng': 126.9942, 'address': '서울특별시 용산구 이태원동'},
+    '이태원역': {'lat': 37.5346, 'lng': 126.9942, 'address': '서울특별시 용산구 이태원동'},
+    '잠실': {'lat': 37.5134, 'lng': 127.1000, 'address': '서울특별시 송파구 잠실동'},
+    '잠실역': {'lat': 37.5134, 'lng': 127.1000, 'address': '서울특별시 송파구 잠실동'},
+    '건대': {'lat': 37.5404, 'lng': 127.0696, 'address': '서울특별시 광진구 화양동'},
+    '건대입구역': {'lat': 37.5404, 'lng': 127.0696, 'address': '서울특별시 광진구 화양동'},
+    '노원': {'lat': 37.6547, 'lng': 127.0613, 'address': '서울특별시 노원구'},
+    '노원역': {'lat': 37.6547, 'lng': 127.0613, 'address': '서울특별시 노원구'},
+    '수원': {'lat': 37.2636, 'lng': 127.0286, 'address': '경기도 수원시'},
+    '수원역': {'lat': 37.2636, 'lng': 127.0286, 'address': '경기도 수원시'},
+    '인천': {'lat': 37.4563, 'lng': 126.7052, 'address': '인천광역시'},
+    '인천역': {'lat': 37.4563, 'lng': 126.7052, 'address': '인천광역시'},
+    # 서울 구별 중심점
+    '강남구': {'lat': 37.5172, 'lng': 127.0473, 'address': '서울특별시 강남구'},
+    '서초구': {'lat': 37.4836, 'lng': 127.0327, 'address': '서울특별시 서초구'},
+    '송파구': {'lat': 37.5145, 'lng': 127.1065, 'address': '서울특별시 송파구'},
+    '강동구': {'lat': 37.5301, 'lng': 127.1238, 'address': '서울특별시 강동구'},
+    '마포구': {'lat': 37.5663, 'lng': 126.9019, 'address': '서울특별시 마포구'},
+    '영등포구': {'lat': 37.5264, 'lng': 126.8962, 'address': '서울특별시 영등포구'},
+    '용산구': {'lat': 37.5384, 'lng': 126.9646, 'address': '서울특별시 용산구'},
+    '성동구': {'lat': 37.5634, 'lng': 127.0367, 'address': '서울특별시 성동구'},
+    '광진구': {'lat': 37.5481, 'lng': 127.0857, 'address': '서울특별시 광진구'},
+    '동대문구': {'lat': 37.5838, 'lng': 127.0507, 'address': '서울특별시 동대문구'},
+    '중랑구': {'lat': 37.6066, 'lng': 127.0925, 'address': '서울특별시 중랑구'},
+    '성북구': {'lat': 37.6066, 'lng': 127.0181, 'address': '서울특별시 성북구'},
+    '강북구': {'lat': 37.6398, 'lng': 127.0256, 'address': '서울특별시 강북구'},
+    '도봉구': {'lat': 37.6687, 'lng': 127.0471, 'address': '서울특별시 도봉구'},
+    '노원구': {'lat': 37.6542, 'lng': 127.0568, 'address': '서울특별시 노원구'},
+    '은평구': {'lat': 37.6177, 'lng': 126.9227, 'address': '서울특별시 은평구'},
+    '서대문구': {'lat': 37.5791, 'lng': 126.9368, 'address': '서울특별시 서대문구'},
+    '종로구': {'lat': 37.5729, 'lng': 126.9792, 'address': '서울특별시 종로구'},
+    '중구': {'lat': 37.5637, 'lng': 126.9975, 'address': '서울특별시 중구'},
+    '관악구': {'lat': 37.4784, 'lng': 126.9516, 'address': '서울특별시 관악구'},
+    '동작구': {'lat': 37.5125, 'lng': 126.9399, 'address': '서울특별시 동작구'},
+    '금천구': {'lat': 37.4569, 'lng': 126.8955, 'address': '서울특별시 금천구'},
+    '구로구': {'lat': 37.4955, 'lng': 126.8875, 'address': '서울특별시 구로구'},
+    '양천구': {'lat': 37.5170, 'lng': 126.8664, 'address': '서울특별시 양천구'},
+    '강서구': {'lat': 37.5510, 'lng': 126.8495, 'address': '서울특별시 강서구'}
+}
+
 class LocationExtractor:
     """위치 추출 및 좌표 변환 클래스"""
     
     def __init__(self):
-        # 주요 지역 좌표 매핑 (서울 중심)
-        self.location_mapping = {
-            # 서울 주요 역/지역
-            '강남역': {'lat': 37.4979, 'lng': 127.0276, 'address': '서울특별시 강남구 강남대로 지하396'},
-            '홍대': {'lat': 37.5516, 'lng': 126.9226, 'address': '서울특별시 마포구 홍익로'},
-            '홍대입구역': {'lat': 37.5516, 'lng': 126.9226, 'address': '서울특별시 마포구 홍익로'},
-            '신촌': {'lat': 37.5596, 'lng': 126.9361, 'address': '서울특별시 서대문구 신촌동'},
-            '신촌역': {'lat': 37.5596, 'lng': 126.9361, 'address': '서울특별시 서대문구 신촌동'},
-            '명동': {'lat': 37.5636, 'lng': 126.9826, 'address': '서울특별시 중구 명동'},
-            '명동역': {'lat': 37.5636, 'lng': 126.9826, 'address': '서울특별시 중구 명동'},
-            '종로': {'lat': 37.5704, 'lng': 126.9826, 'address': '서울특별시 종로구 종로'},
-            '종로3가역': {'lat': 37.5704, 'lng': 126.9826, 'address': '서울특별시 종로구 종로'},
-            '이태원': {'lat': 37.5346, 'lng': 126.9942, 'address': '서울특별시 용산구 이태원동'},
-            '이태원역': {'lat': 37.5346, 'lng': 126.9942, 'address': '서울특별시 용산구 이태원동'},
-            '잠실': {'lat': 37.5134, 'lng': 127.1000, 'address': '서울특별시 송파구 잠실동'},
-            '잠실역': {'lat': 37.5134, 'lng': 127.1000, 'address': '서울특별시 송파구 잠실동'},
-            '건대': {'lat': 37.5404, 'lng': 127.0696, 'address': '서울특별시 광진구 화양동'},
-            '건대입구역': {'lat': 37.5404, 'lng': 127.0696, 'address': '서울특별시 광진구 화양동'},
-            '노원': {'lat': 37.6547, 'lng': 127.0613, 'address': '서울특별시 노원구'},
-            '노원역': {'lat': 37.6547, 'lng': 127.0613, 'address': '서울특별시 노원구'},
-            '수원': {'lat': 37.2636, 'lng': 127.0286, 'address': '경기도 수원시'},
-            '수원역': {'lat': 37.2636, 'lng': 127.0286, 'address': '경기도 수원시'},
-            '인천': {'lat': 37.4563, 'lng': 126.7052, 'address': '인천광역시'},
-            '인천역': {'lat': 37.4563, 'lng': 126.7052, 'address': '인천광역시'},
-            # 서울 구별 중심점
-            '강남구': {'lat': 37.5172, 'lng': 127.0473, 'address': '서울특별시 강남구'},
-            '서초구': {'lat': 37.4836, 'lng': 127.0327, 'address': '서울특별시 서초구'},
-            '송파구': {'lat': 37.5145, 'lng': 127.1065, 'address': '서울특별시 송파구'},
-            '강동구': {'lat': 37.5301, 'lng': 127.1238, 'address': '서울특별시 강동구'},
-            '마포구': {'lat': 37.5663, 'lng': 126.9019, 'address': '서울특별시 마포구'},
-            '영등포구': {'lat': 37.5264, 'lng': 126.8962, 'address': '서울특별시 영등포구'},
-            '용산구': {'lat': 37.5384, 'lng': 126.9646, 'address': '서울특별시 용산구'},
-            '성동구': {'lat': 37.5634, 'lng': 127.0367, 'address': '서울특별시 성동구'},
-            '광진구': {'lat': 37.5481, 'lng': 127.0857, 'address': '서울특별시 광진구'},
-            '동대문구': {'lat': 37.5838, 'lng': 127.0507, 'address': '서울특별시 동대문구'},
-            '중랑구': {'lat': 37.6066, 'lng': 127.0925, 'address': '서울특별시 중랑구'},
-            '성북구': {'lat': 37.6066, 'lng': 127.0181, 'address': '서울특별시 성북구'},
-            '강북구': {'lat': 37.6398, 'lng': 127.0256, 'address': '서울특별시 강북구'},
-            '도봉구': {'lat': 37.6687, 'lng': 127.0471, 'address': '서울특별시 도봉구'},
-            '노원구': {'lat': 37.6542, 'lng': 127.0568, 'address': '서울특별시 노원구'},
-            '은평구': {'lat': 37.6177, 'lng': 126.9227, 'address': '서울특별시 은평구'},
-            '서대문구': {'lat': 37.5791, 'lng': 126.9368, 'address': '서울특별시 서대문구'},
-            '종로구': {'lat': 37.5729, 'lng': 126.9792, 'address': '서울특별시 종로구'},
-            '중구': {'lat': 37.5637, 'lng': 126.9975, 'address': '서울특별시 중구'},
-            '관악구': {'lat': 37.4784, 'lng': 126.9516, 'address': '서울특별시 관악구'},
-            '동작구': {'lat': 37.5125, 'lng': 126.9399, 'address': '서울특별시 동작구'},
-            '금천구': {'lat': 37.4569, 'lng': 126.8955, 'address': '서울특별시 금천구'},
-            '구로구': {'lat': 37.4955, 'lng': 126.8875, 'address': '서울특별시 구로구'},
-            '양천구': {'lat': 37.5170, 'lng': 126.8664, 'address': '서울특별시 양천구'},
-            '강서구': {'lat': 37.5510, 'lng': 126.8495, 'address': '서울특별시 강서구'}
-        }
+        # 주요 지역 좌표 매핑 (모듈 레벨 상수를 공유 참조)
+        self.location_mapping = _LOCATION_MAPPING
         
-        # 위치 추출 패턴
-        self.location_patterns = [
-            r'([가-힣]+역)\s*(?:에서?|근처|앞)',
-            r'([가-힣]+구)\s*(?:에서?|근처|일대)',
-            r'([가-힣]+동)\s*(?:에서?|근처)',
-            r'([가-힣]+로)\s*(?:에서?|근처)',
-            r'([가-힣]+거리)\s*(?:에서?|근처)',
-            r'([가-힣]+공원)\s*(?:에서?|근처)',
-            r'([가-힣]+대학교?)\s*(?:에서?|근처|앞)',
-            r'([가-힣]+시장)\s*(?:에서?|근처)',
-            r'([가-힣]+병원)\s*(?:에서?|근처|앞)'
-        ]
+        # 주변 검색용 SoA(Structure-of-Arrays) 뷰
+        # (dict-of-dicts를 엔트리별로 순회하는 대신 numpy 배열 연산 한 번으로)
+        self._names = np.array(list(self.location_mapping.keys()))
+        self._lats = np.array(
+            [coords['lat'] for coords in self.location_mapping.values()], dtype=np.float64
+        )
+        self._lngs = np.array(
+            [coords['lng'] for coords in self.location_mapping.values()], dtype=np.float64
+        )
+
+        # 위치 추출 패턴 (TextAnalyzer와 공유하는 통합 얼터네이션)
+        self.location_pattern = LOCATION_RE
+
+        # 지오코딩용 공유 HTTP 세션 (호출마다 TCP+TLS 핸드셰이크 방지,
+        # 수명은 main.py의 lifespan에서 startup/aclose로 관리)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._kakao_api_key = os.getenv("KAKAO_REST_API_KEY")
+        self._geocode_cache: Dict[str, Dict[str, Any]] = {}
+
+        # 지명 사전 일괄 매칭용 Aho-Corasick 오토마톤
+        # (지명마다 substring 검색을 반복하는 대신 텍스트를 한 번만 스캔)
+        self._location_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for name, coords in self.location_mapping.items():
+                automaton.add_word(name, (name, coords))
+            automaton.make_automaton()
+            self._location_automaton = automaton
+
+    async def startup(self):
+        """공유 aiohttp 세션 생성 (애플리케이션 시작 시 호출)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+
+    async def aclose(self):
+        """보유한 네트워크 자원 정리 (애플리케이션 종료 시 호출)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def geocode(self, location_name: str) -> Optional[Dict[str, Any]]:
+        """카카오 로컬 API로 지명을 좌표로 변환 (지명별 캐시)
+
+        KAKAO_REST_API_KEY가 없으면 None을 반환하고 호출 측은
+        _get_coordinates의 추정 좌표로 폴백한다.
+        """
+        if location_name in self._geocode_cache:
+            return self._geocode_cache[location_name]
+
+        if not self._kakao_api_key or self._session is None:
+            return None
+
+        try:
+            async with self._session.get(
+                'https://dapi.kakao.com/v2/local/search/keyword.json',
+                params={'query': location_name, 'size': 1},
+                headers={'Authorization': f'KakaoAK {self._kakao_api_key}'}
+            ) as response:
+                data = await response.json()
+
+            documents = data.get('documents') or []
+            if not documents:
+                return None
+
+            document = documents[0]
+            coords = {
+                'lat': float(document['y']),
+                'lng': float(document['x']),
+                'address': document.get('address_name', location_name)
+            }
+            self._geocode_cache[location_name] = coords
+            return coords
+
+        except Exception as e:
+            logger.error(f"지오코딩 중 오류: {str(e)}")
+            return None
+
+    async def resolve_unmapped_locations(self, texts: List[str]) -> None:
+        """배치 텍스트에 등장한 미등록 지명을 지오코딩해 캐시를 채움
+
+        크롤링 경로에서 분석 직전에 호출한다. 이후 워커 스레드의
+        extract_location은 네트워크 호출 없이 _geocode_cache의 실제
+        좌표를 읽는다. API 키가 없으면 아무 것도 하지 않는다.
+        """
+        if not self._kakao_api_key or self._session is None:
+            return
+
+        names = set()
+        for text in texts:
+            for name in self._extract_location_names(text):
+                if name not in self.location_mapping and name not in self._geocode_cache:
+                    names.add(name)
+
+        if names:
+            await asyncio.gather(*(self.geocode(name) for name in names))
+
+    def _match_known_location(self, text: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """매핑된 지명 중 텍스트에 등장하는 것 반환 (최장 일치 우선)"""
+        if self._location_automaton is not None:
+            best = None
+            for _, (name, coords) in self._location_automaton.iter(text):
+                if best is None or len(name) > len(best[0]):
+                    best = (name, coords)
+            return best
+
+        # 오토마톤이 없으면 기존 방식대로 지명별 substring 스캔
+        for name, coords in self.location_mapping.items():
+            if name in text:
+                return name, coords
+        return None
     
-    async def extract_location(self, text: str) -> Optional[Location]:
+    def extract_locations(self, texts: List[str]) -> List[Optional[Location]]:
+        """크롤링 배치 단위 일괄 위치 추출"""
+        return [self.extract_location(text) for text in texts]
+
+    def extract_location(self, text: str) -> Optional[Location]:
         """텍스트에서 위치 정보 추출"""
         try:
-            # 직접 매핑된 위치 확인
-            for location_name, coords in self.location_mapping.items():
-                if location_name in text:
-                    return Location(
-                        latitude=coords['lat'],
-                        longitude=coords['lng'],
-                        address=coords['address'],
-                        district=self._extract_district(coords['address']),
-                        city=self._extract_city(coords['address'])
-                    )
-            
-            # 패턴 매칭으로 위치 추출
-            locations = self._extract_location_names(text)
-            if locations:
-                # 첫 번째 위치를 기준으로 좌표 추정
-                location_name = locations[0]
-                coords = await self._get_coordinates(location_name)
-                if coords:
-                    return Location(
-                        latitude=coords['lat'],
-                        longitude=coords['lng'],
-                        address=coords.get('address', location_name),
-                        district=self._extract_district(coords.get('address', '')),
-                        city=self._extract_city(coords.get('address', ''))
-                    )
-            
-            return None
-            
+            # 추출 결과는 텍스트에만 의존하므로 캐시에서 재사용
+            # (리트윗/복붙으로 같은 본문이 반복 유입되는 경우가 많음)
+            fields = self._extract_location_cached(text)
+            if fields is None:
+                return None
+
+            latitude, longitude, address, district, city = fields
+            return Location(
+                latitude=latitude,
+                longitude=longitude,
+                address=address,
+                district=district,
+                city=city
+            )
+
         except Exception as e:
             logger.error(f"위치 추출 중 오류: {str(e)}")
             return None
+
+    @lru_cache(maxsize=2048)
+    def _extract_location_cached(
+        self, text: str
+    ) -> Optional[Tuple[float, float, str, Optional[str], Optional[str]]]:
+        """텍스트별 위치 필드 계산 (가변 Location 대신 기본형 튜플을 캐시)"""
+        # 직접 매핑된 위치 확인 (단일 스캔)
+        match = self._match_known_location(text)
+        if match:
+            _, coords = match
+            return (
+                coords['lat'],
+                coords['lng'],
+                coords['address'],
+                self._extract_district(coords['address']),
+                self._extract_city(coords['address'])
+            )
+
+        # 패턴 매칭으로 위치 추출
+        locations = self._extract_location_names(text)
+        if locations:
+            # 첫 번째 위치를 기준으로 좌표 추정
+            location_name = locations[0]
+            coords = self._get_coordinates(location_name)
+            if coords:
+                return (
+                    coords['lat'],
+                    coords['lng'],
+                    coords.get('address', location_name),
+                    self._extract_district(coords.get('address', '')),
+                    self._extract_city(coords.get('address', ''))
+                )
+
+        return None
     
     def _extract_location_names(self, text: str) -> List[str]:
-        """패턴 매칭으로 위치명 추출"""
-        locations = []
-        
-        for pattern in self.location_patterns:
-            matches = re.findall(pattern, text)
-            locations.extend(matches)
-        
-        return list(set(locations))  # 중복 제거
+        """패턴 매칭으로 위치명 추출 (단일 스캔)"""
+        return list(set(self.location_pattern.findall(text)))  # 중복 제거
     
-    async def _get_coordinates(self, location_name: str) -> Optional[Dict[str, Any]]:
+    def _get_coordinates(self, location_name: str) -> Optional[Dict[str, Any]]:
         """위치명을 좌표로 변환 (카카오 지도 API 또는 추정)"""
         try:
             # 먼저 기본 매핑에서 확인
             if location_name in self.location_mapping:
                 return self.location_mapping[location_name]
-            
-            # 서울 내 주요 지역 추정
+
+            # 지오코더가 채워 둔 캐시가 있으면 실제 좌표 사용
+            cached = self._geocode_cache.get(location_name)
+            if cached:
+                return cached
+
+            # 서울 내 주요 지역 추정 (결정적 오프셋 + 지명별 캐시)
             if any(suffix in location_name for suffix in ['역', '구', '동']):
-                # 서울 시내 임의 좌표로 추정 (실제로는 외부 API 사용)
+                lat, lng = _estimated_coordinates(location_name)
                 return {
-                    'lat': 37.5665 + (hash(location_name) % 1000) / 10000,  # 서울 중심 근처
-                    'lng': 126.9780 + (hash(location_name) % 1000) / 10000,
+                    'lat': lat,
+                    'lng': lng,
                     'address': f'서울특별시 {location_name}'
                 }
             
@@ -149,8 +300,7 @@ class LocationExtractor:
             return None
         
         # 구/군 패턴 매칭
-        district_pattern = r'([가-힣]+구|[가-힣]+군)'
-        match = re.search(district_pattern, address)
+        match = _DISTRICT_RE.search(address)
         return match.group(1) if match else None
     
     def _extract_city(self, address: str) -> Optional[str]:
@@ -159,21 +309,16 @@ class LocationExtractor:
             return None
         
         # 시/도 패턴 매칭
-        city_pattern = r'([가-힣]+시|[가-힣]+도|[가-힣]+특별시|[가-힣]+광역시)'
-        match = re.search(city_pattern, address)
+        match = _CITY_RE.search(address)
         return match.group(1) if match else None
     
     async def get_nearby_locations(self, latitude: float, longitude: float, radius: float = 1.0) -> List[str]:
-        """주변 지역 검색"""
-        nearby = []
-        
-        for location_name, coords in self.location_mapping.items():
-            # 간단한 거리 계산 (정확하지 않음, 실제로는 haversine 공식 사용)
-            lat_diff = abs(coords['lat'] - latitude)
-            lng_diff = abs(coords['lng'] - longitude)
-            distance = (lat_diff**2 + lng_diff**2)**0.5
-            
-            if distance <= radius / 100:  # 대략적인 거리 비교
-                nearby.append(location_name)
-        
-        return nearby
\ No newline at end of file
+        """주변 지역 검색 (radius 단위: km)"""
+        # haversine 공식을 전체 매핑에 대해 numpy 배열 연산 한 번으로 계산
+        lat1, lon1 = np.radians(latitude), np.radians(longitude)
+        lat2, lon2 = np.radians(self._lats), np.radians(self._lngs)
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        d_km = 2 * 6371.0 * np.arcsin(np.sqrt(a))
+        return self._names[d_km <= radius].tolist()
\ No newline at end of file
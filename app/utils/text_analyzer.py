@@ -1,56 +1,80 @@
-import re
-from typing import Dict, Any, List
-import asyncio
+from functools import lru_cache
+from typing import Dict, Any, Final, List, Tuple
 from datetime import datetime
 import logging
 
+from app.utils.korean_patterns import LOCATION_RE
+
 logger = logging.getLogger(__name__)
 
+# 키워드 사전 — 임포트 시 한 번만 생성해 읽기 전용으로 공유
+# 감정 분석 키워드
+_POSITIVE_WORDS: Final[List[str]] = ['좋다', '괜찮다', '재미있다', '신기하다', '놀랍다']
+_NEGATIVE_WORDS: Final[List[str]] = ['싫다', '짜증', '혐오', '더럽다', '역겹다', '끔찍하다', '최악', '지옥']
+
+# 강도 표현 키워드
+_INTENSITY_WORDS: Final[Dict[str, List[str]]] = {
+    'high': ['엄청', '완전', '진짜', '대박', '미친', '떼거리', '지옥'],
+    'medium': ['많이', '꽤', '제법', '좀', '조금'],
+    'low': ['약간', '살짝', '가끔']
+}
+
 class TextAnalyzer:
     """텍스트 분석 클래스"""
     
     def __init__(self):
-        # 감정 분석을 위한 키워드 사전
-        self.positive_words = ['좋다', '괜찮다', '재미있다', '신기하다', '놀랍다']
-        self.negative_words = ['싫다', '짜증', '혐오', '더럽다', '역겹다', '끔찍하다', '최악', '지옥']
-        
-        # 강도 표현 키워드
-        self.intensity_words = {
-            'high': ['엄청', '완전', '진짜', '대박', '미친', '떼거리', '지옥'],
-            'medium': ['많이', '꽤', '제법', '좀', '조금'],
-            'low': ['약간', '살짝', '가끔']
-        }
-        
-        # 위치 패턴
-        self.location_patterns = [
-            r'([가-힣]+역)\s*에서?',
-            r'([가-힣]+구)\s*에서?',
-            r'([가-힣]+동)\s*에서?',
-            r'([가-힣]+로)\s*에서?',
-            r'([가-힣]+거리)\s*에서?',
-            r'([가-힣]+공원)\s*에서?',
-            r'([가-힣]+대학교?)\s*에서?'
-        ]
-    
-    async def analyze_text(self, text: str) -> Dict[str, Any]:
+        # 키워드 사전 (모듈 레벨 상수를 공유 참조)
+        self.positive_words = _POSITIVE_WORDS
+        self.negative_words = _NEGATIVE_WORDS
+        self.intensity_words = _INTENSITY_WORDS
+
+        # 위치 패턴 (LocationExtractor와 공유하는 통합 얼터네이션)
+        self.location_pattern = LOCATION_RE
+
+        # 카테고리별 키워드 리스트를 단어→카테고리 멀티맵으로 뒤집어
+        # 분석마다 리스트별로 텍스트를 다시 훑는 대신 한 번만 스캔
+        # (같은 단어가 여러 카테고리에 속할 수 있음, 예: '지옥')
+        self._keyword_categories: Dict[str, List[str]] = {}
+        category_words = (
+            ('positive', self.positive_words),
+            ('negative', self.negative_words),
+            ('intensity_high', self.intensity_words['high']),
+            ('intensity_medium', self.intensity_words['medium']),
+            ('intensity_low', self.intensity_words['low']),
+            # 신뢰도 계산용 러브버그/시간 키워드
+            ('lovebug', ['러브버그', '붉은등우단털파리', '빨간벌레', '차에 붙은']),
+            ('time', ['지금', '오늘', '방금', '현재', '지금껏']),
+            # 관련성 계산용 직접/간접/상황 키워드
+            ('direct', ['러브버그', '붉은등우단털파리']),
+            ('indirect', ['빨간벌레', '파리', '벌레', '차에 붙은']),
+            ('context', ['떼', '많아', '붙어', '달라붙']),
+        )
+        self._category_names = [name for name, _ in category_words]
+        for category, words in category_words:
+            for word in words:
+                self._keyword_categories.setdefault(word, []).append(category)
+
+    def _count_keywords(self, text: str) -> Dict[str, int]:
+        """카테고리별 키워드 등장 수를 단일 패스로 집계"""
+        counts = dict.fromkeys(self._category_names, 0)
+        for word, categories in self._keyword_categories.items():
+            if word in text:
+                for category in categories:
+                    counts[category] += 1
+        return counts
+
+    def analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """크롤링 배치 단위 일괄 분석 (호출 경계를 배치당 한 번으로)"""
+        return [self.analyze_text(text) for text in texts]
+
+    def analyze_text(self, text: str) -> Dict[str, Any]:
         """텍스트 종합 분석"""
         try:
-            # 기본 정보 추출
-            word_count = len(text.split())
-            char_count = len(text)
-            
-            # 감정 분석
-            sentiment = self._analyze_sentiment(text)
-            
-            # 강도 분석
-            intensity = self._analyze_intensity(text)
-            
-            # 키워드 신뢰도 계산
-            confidence = self._calculate_confidence(text)
-            
-            # 러브버그 관련성 점수
-            relevance = self._calculate_relevance(text)
-            
+            # 점수 계산은 텍스트에만 의존하므로 캐시에서 재사용
+            # (리트윗/복붙으로 같은 본문이 반복 유입되는 경우가 많음)
+            (sentiment, intensity, confidence, relevance,
+             word_count, char_count) = self._analyze_text_cached(text)
+
             return {
                 'sentiment': sentiment,
                 'intensity': intensity,
@@ -72,15 +96,31 @@ class TextAnalyzer:
                 'char_count': 0,
                 'analysis_timestamp': datetime.now().isoformat()
             }
-    
-    def _analyze_sentiment(self, text: str) -> float:
+
+    @lru_cache(maxsize=2048)
+    def _analyze_text_cached(self, text: str) -> Tuple[float, str, float, float, int, int]:
+        """텍스트별 점수 계산 (타임스탬프를 제외한 순수 계산만 캐시)"""
+        word_count = len(text.split())
+        char_count = len(text)
+
+        # 키워드 매칭은 한 번만 수행하고 이후는 카운트 산술
+        counts = self._count_keywords(text)
+
+        return (
+            self._analyze_sentiment(counts, word_count),
+            self._analyze_intensity(counts),
+            self._calculate_confidence(text, counts),
+            self._calculate_relevance(counts),
+            word_count,
+            char_count,
+        )
+
+    def _analyze_sentiment(self, counts: Dict[str, int], total_words: int) -> float:
         """감정 분석 (-1.0 ~ 1.0)"""
-        positive_count = sum(1 for word in self.positive_words if word in text)
-        negative_count = sum(1 for word in self.negative_words if word in text)
-        
+        positive_count = counts['positive']
+        negative_count = counts['negative']
+
         # 러브버그 관련 텍스트는 대부분 부정적
-        total_words = len(text.split())
-        
         if total_words == 0:
             return 0.0
         
@@ -92,78 +132,47 @@ class TextAnalyzer:
         else:
             return -0.2  # 기본적으로 약간 부정적
     
-    def _analyze_intensity(self, text: str) -> str:
+    def _analyze_intensity(self, counts: Dict[str, int]) -> str:
         """강도 분석"""
-        text_lower = text.lower()
-        
-        # 강도별 키워드 매칭
-        high_score = sum(1 for word in self.intensity_words['high'] if word in text_lower)
-        medium_score = sum(1 for word in self.intensity_words['medium'] if word in text_lower)
-        low_score = sum(1 for word in self.intensity_words['low'] if word in text_lower)
-        
-        if high_score > 0:
+        if counts['intensity_high'] > 0:
             return 'high'
-        elif medium_score > 0:
+        elif counts['intensity_medium'] > 0:
             return 'medium'
-        elif low_score > 0:
+        elif counts['intensity_low'] > 0:
             return 'low'
         else:
             return 'medium'  # 기본값
     
-    def _calculate_confidence(self, text: str) -> float:
+    def _calculate_confidence(self, text: str, counts: Dict[str, int]) -> float:
         """신뢰도 계산 (0.0 ~ 1.0)"""
         confidence = 0.5  # 기본값
-        
+
         # 러브버그 관련 키워드가 있으면 신뢰도 증가
-        lovebug_keywords = ['러브버그', '붉은등우단털파리', '빨간벌레', '차에 붙은']
-        keyword_count = sum(1 for keyword in lovebug_keywords if keyword in text)
-        confidence += keyword_count * 0.2
+        confidence += counts['lovebug'] * 0.2
         
         # 위치 정보가 있으면 신뢰도 증가
-        location_found = any(re.search(pattern, text) for pattern in self.location_patterns)
+        location_found = self.location_pattern.search(text) is not None
         if location_found:
             confidence += 0.2
         
         # 시간 정보가 있으면 신뢰도 증가
-        time_keywords = ['지금', '오늘', '방금', '현재', '지금껏']
-        if any(keyword in text for keyword in time_keywords):
+        if counts['time'] > 0:
             confidence += 0.1
         
         return min(1.0, confidence)
     
-    def _calculate_relevance(self, text: str) -> float:
+    def _calculate_relevance(self, counts: Dict[str, int]) -> float:
         """러브버그 관련성 점수 (0.0 ~ 1.0)"""
-        relevance = 0.0
-        
-        # 직접적인 러브버그 언급
-        direct_keywords = ['러브버그', '붉은등우단털파리']
-        for keyword in direct_keywords:
-            if keyword in text:
-                relevance += 0.4
-        
-        # 간접적인 언급
-        indirect_keywords = ['빨간벌레', '파리', '벌레', '차에 붙은']
-        for keyword in indirect_keywords:
-            if keyword in text:
-                relevance += 0.2
-        
-        # 상황 키워드
-        context_keywords = ['떼', '많아', '붙어', '달라붙']
-        for keyword in context_keywords:
-            if keyword in text:
-                relevance += 0.1
-        
+        relevance = (
+            counts['direct'] * 0.4      # 직접적인 러브버그 언급
+            + counts['indirect'] * 0.2  # 간접적인 언급
+            + counts['context'] * 0.1   # 상황 키워드
+        )
         return min(1.0, relevance)
     
     def extract_locations_from_text(self, text: str) -> List[str]:
-        """텍스트에서 위치 정보 추출"""
-        locations = []
-        
-        for pattern in self.location_patterns:
-            matches = re.findall(pattern, text)
-            locations.extend(matches)
-        
-        return list(set(locations))  # 중복 제거
+        """텍스트에서 위치 정보 추출 (단일 스캔)"""
+        return list(set(self.location_pattern.findall(text)))  # 중복 제거
     
     def extract_keywords(self, text: str) -> List[str]:
         """키워드 추출"""
@@ -1,21 +1,26 @@
-from typing import List, Dict, Any
+from typing import List, Set, Dict, Any
 from fastapi import WebSocket
-import json
+import asyncio
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 한 번에 동시 전송할 연결 수 (느린 클라이언트가 전체를 막지 않도록 분할)
+BROADCAST_CHUNK_SIZE = 50
+
 class WebSocketManager:
     """웹소켓 연결 관리 클래스"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # 연결 해제가 O(n) 리스트 탐색이 되지 않도록 set으로 관리
+        self.active_connections: Set[WebSocket] = set()
         self.connection_info: Dict[WebSocket, Dict[str, Any]] = {}
     
     async def connect(self, websocket: WebSocket, user_id: str = None):
         """웹소켓 연결 수락"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         self.connection_info[websocket] = {
             'user_id': user_id,
             'connected_at': None,
@@ -26,14 +31,14 @@ class WebSocketManager:
     def disconnect(self, websocket: WebSocket):
         """웹소켓 연결 해제"""
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
             user_info = self.connection_info.pop(websocket, {})
             logger.info(f"웹소켓 연결 해제: {user_info.get('user_id', 'anonymous')}")
     
     async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
         """개별 클라이언트에게 메시지 전송"""
         try:
-            await websocket.send_text(json.dumps(message, ensure_ascii=False))
+            await websocket.send_bytes(orjson.dumps(message, default=str))
         except Exception as e:
             logger.error(f"개별 메시지 전송 실패: {str(e)}")
             self.disconnect(websocket)
@@ -44,15 +49,25 @@ class WebSocketManager:
             return
         
         disconnected_connections = []
-        message_str = json.dumps(message, ensure_ascii=False)
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error(f"브로드캐스트 전송 실패: {str(e)}")
-                disconnected_connections.append(connection)
-        
+        # orjson은 UTF-8 bytes를 바로 내놓으므로 한 번 인코딩해 전 연결에 재사용
+        # (datetime은 네이티브 지원, 그 외 미지원 타입은 str로 직렬화)
+        payload = orjson.dumps(message, default=str)
+
+        # 연결별 순차 전송 대신 청크 단위 동시 전송
+        # (청크 사이에 sleep(0)으로 제어권을 넘겨 다른 태스크가 굶지 않도록)
+        connections = list(self.active_connections)
+        for start in range(0, len(connections), BROADCAST_CHUNK_SIZE):
+            chunk = connections[start:start + BROADCAST_CHUNK_SIZE]
+            results = await asyncio.gather(
+                *(connection.send_bytes(payload) for connection in chunk),
+                return_exceptions=True
+            )
+            for connection, result in zip(chunk, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"브로드캐스트 전송 실패: {str(result)}")
+                    disconnected_connections.append(connection)
+            await asyncio.sleep(0)
+
         # 연결 실패한 클라이언트들 제거
         for connection in disconnected_connections:
             self.disconnect(connection)
@@ -7,5 +7,5 @@ echo "Starting Lovebug Map Backend..."
 echo "PORT: $PORT"
 echo "MONGODB_URL: $MONGODB_URL"
 
-# 애플리케이션 실행
-python -m uvicorn app.main:app --host 0.0.0.0 --port $PORT 
\ No newline at end of file
+# 애플리케이션 실행 (uvloop 이벤트 루프 + httptools HTTP 파서)
+python -m uvicorn app.main:app --host 0.0.0.0 --port $PORT --loop uvloop --http httptools 
\ No newline at end of file